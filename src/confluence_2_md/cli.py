@@ -4,22 +4,34 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import sys
+from functools import cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install "confluence-2-md[fast]"
+    orjson = None
+
 from confluence_2_md.config import load_settings
-from confluence_2_md.converter import convert
+from confluence_2_md.converter import convert, convert_stream
 from confluence_2_md.fetcher import ConfluenceFetcher
 from confluence_2_md.url_parser import parse_confluence_url
 
+_ILLEGAL_CHARS_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', " "))
+_COLLAPSE_RE = re.compile(r" {2,}")
+
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
 
 def _sanitize_filename(title: str) -> str:
     """Convert a page title to a safe filename, preserving spaces."""
     # Replace characters illegal in filenames
-    name = re.sub(r'[<>:"/\\|?*]', " ", title)
+    name = title.translate(_ILLEGAL_CHARS_TABLE)
     # Collapse multiple spaces
-    name = re.sub(r" {2,}", " ", name).strip()
+    name = _COLLAPSE_RE.sub(" ", name).strip()
     return name or "page"
 
 
@@ -37,7 +49,9 @@ def _resolve_output_path(output_arg: str, title: str) -> Path:
     return p
 
 
+@cache
 def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; repeated in-process main() calls reuse it."""
     p = argparse.ArgumentParser(
         prog="confluence2md",
         description="Convert Confluence pages to Markdown.",
@@ -136,6 +150,7 @@ def main(argv: list[str] | None = None) -> None:
     # Use base_url from parsed URL if settings doesn't have one from CLI
     if parsed["base_url"] and not args.base_url:
         settings.CONFLUENCE_BASE_URL = parsed["base_url"]
+        fetcher.close()
         fetcher = ConfluenceFetcher(settings)
 
     # Fetch page
@@ -159,13 +174,15 @@ def main(argv: list[str] | None = None) -> None:
     # Image directory = same name as the .md file (without extension)
     image_dir_name = _sanitize_filename(page.title) if out_path else "assets"
 
-    # Convert HTML → Markdown
-    markdown = convert(
-        page.html_content,
-        download_images=download_images,
-        image_dir=image_dir_name,
-        obsidian=args.obsidian,
-    )
+    # Convert HTML → Markdown (file output is streamed straight to disk below)
+    convert_options = {
+        "download_images": download_images,
+        "image_dir": image_dir_name,
+        "obsidian": args.obsidian,
+        # JSON output with --no-images: leave image references out entirely
+        "skip_images": args.json_mode and args.no_images,
+    }
+    markdown = None if out_path else convert(page.html_content, **convert_options)
 
     # Download images if needed
     if download_images and page.attachments:
@@ -183,14 +200,15 @@ def main(argv: list[str] | None = None) -> None:
             else:
                 assets_dir = Path.cwd() / "assets"
 
-            for att in image_attachments:
-                try:
-                    fetcher.download_attachment(att, assets_dir)
-                except Exception as e:
-                    print(
-                        f"Warning: Failed to download {att.filename}: {e}",
-                        file=sys.stderr,
-                    )
+            def warn(att, e):
+                print(
+                    f"Warning: Failed to download {att.filename}: {e}",
+                    file=sys.stderr,
+                )
+
+            fetcher.download_attachments(image_attachments, assets_dir, on_error=warn)
+
+    fetcher.close()
 
     # Output
     if args.json_mode:
@@ -200,10 +218,32 @@ def main(argv: list[str] | None = None) -> None:
             "url": page.url,
             "markdown": markdown,
         }
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        if orjson is not None:
+            data = orjson.dumps(result, option=orjson.OPT_INDENT_2) + b"\n"
+        else:
+            data = (json.dumps(result, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+        buffer = getattr(sys.stdout, "buffer", None)
+        if buffer is None:
+            # Text-only stream, e.g. redirect_stdout(io.StringIO())
+            sys.stdout.write(data.decode("utf-8"))
+        else:
+            sys.stdout.flush()
+            buffer.write(data)
+            buffer.flush()
     elif out_path:
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(markdown, encoding="utf-8")
+        # Stream into a sibling temp file and swap it in only once conversion
+        # succeeds, so a failure never truncates an existing output file
+        tmp_path = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(
+                tmp_path, "x", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+            ) as f:
+                convert_stream(page.html_content, f, **convert_options)
+            os.replace(tmp_path, out_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
         print(f"Written to {out_path}", file=sys.stderr)
     else:
         print(markdown)
@@ -1,15 +1,21 @@
 """Configuration management with .env support."""
 
 import os
+from functools import cache
 from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
-def _find_env_file() -> str | None:
-    """Find .env file in priority order: CWD > home directory."""
+@cache
+def _find_env_file(cwd: Path) -> str | None:
+    """Find .env file in priority order: CWD > home directory.
+
+    Called lazily from load_settings() so importing this module does no
+    filesystem probing. Cached per working directory.
+    """
     candidates = [
-        Path.cwd() / ".env",
+        cwd / ".env",
         Path.home() / ".confluence_2_md.env",
     ]
     for candidate in candidates:
@@ -20,7 +26,6 @@ def _find_env_file() -> str | None:
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
-        env_file=_find_env_file(),
         env_file_encoding="utf-8",
         extra="ignore",
     )
@@ -51,7 +56,12 @@ def load_settings(
     token: str | None = None,
 ) -> Settings:
     """Load settings with optional CLI overrides."""
-    settings = Settings()
+    # Set CONFLUENCE_2_MD_SKIP_DOTENV to skip .env files
+    if os.environ.get("CONFLUENCE_2_MD_SKIP_DOTENV"):
+        env_file = None
+    else:
+        env_file = _find_env_file(Path.cwd())
+    settings = Settings(_env_file=env_file)
     if base_url:
         settings.CONFLUENCE_BASE_URL = base_url
     if username:
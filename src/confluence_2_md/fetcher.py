@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -11,6 +14,10 @@ from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponen
 from confluence_2_md.config import Settings
 
 
+_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+_DOWNLOAD_WORKERS = 8
+
+
 class ConfluenceError(Exception):
     def __init__(self, message: str, status_code: int | None = None) -> None:
         super().__init__(message)
@@ -47,9 +54,41 @@ class ConfluenceFetcher:
         self.base_url = settings.CONFLUENCE_BASE_URL.rstrip("/")
         self.api_url = f"{self.base_url}/api/v2"
         self.auth = (settings.CONFLUENCE_USERNAME, settings.CONFLUENCE_TOKEN)
+        # One SSL context shared by every client instead of one per client;
+        # httpx's builder keeps its certifi / SSL_CERT_FILE / SSL_CERT_DIR trust
+        self._ssl_ctx = httpx.create_ssl_context()
+        # Persistent clients so TCP/TLS connections are reused across calls
+        self._client = httpx.Client(
+            auth=self.auth,
+            timeout=30.0,
+            verify=self._ssl_ctx,
+            base_url=self.api_url,
+            headers={"Accept": "application/json"},
+        )
+        # Shared by concurrent attachment downloads
+        self._dl_client = httpx.Client(
+            auth=self.auth,
+            timeout=60.0,
+            follow_redirects=True,
+            verify=self._ssl_ctx,
+            limits=httpx.Limits(
+                max_connections=_DOWNLOAD_WORKERS,
+                max_keepalive_connections=_DOWNLOAD_WORKERS,
+            ),
+        )
+        # short code → page ID; short links are stable, so resolve each once
+        self._short_link_cache: dict[str, str] = {}
 
-    def _headers(self) -> dict[str, str]:
-        return {"Accept": "application/json"}
+    def close(self) -> None:
+        """Close the underlying HTTP connection pools."""
+        self._client.close()
+        self._dl_client.close()
+
+    def __enter__(self) -> ConfluenceFetcher:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     @retry(
         stop=stop_after_attempt(3),
@@ -59,29 +98,78 @@ class ConfluenceFetcher:
     )
     def fetch_page(self, page_id: str) -> PageData:
         """Fetch a page by ID with storage-format body."""
-        url = f"{self.api_url}/pages/{page_id}"
         params = {"body-format": "storage"}
+        resp = self._client.get(f"/pages/{page_id}", params=params)
+        data = self._page_json(page_id, resp)
+
+        # Fetch attachments
+        attachments = self._fetch_attachments(page_id)
 
-        with httpx.Client(auth=self.auth, timeout=30.0) as client:
-            resp = client.get(url, headers=self._headers(), params=params)
+        return self._page_data(page_id, data, attachments)
 
-            if resp.status_code == 404:
-                raise ConfluenceError(f"Page not found: {page_id}", 404)
-            if resp.status_code != 200:
-                raise ConfluenceError(
-                    f"Failed to fetch page {page_id}: {resp.text}",
-                    resp.status_code,
-                )
+    async def fetch_page_async(self, page_id: str) -> PageData:
+        """Fetch a page, requesting its body and attachments concurrently."""
+        async with self._async_client() as client:
+            return await self._fetch_page_async(client, page_id)
+
+    async def fetch_pages(
+        self, page_ids: list[str], concurrency: int = 8
+    ) -> list[PageData]:
+        """Fetch several pages concurrently, at most `concurrency` at a time."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async with self._async_client() as client:
 
-            data = resp.json()
+            async def fetch_one(page_id: str) -> PageData:
+                async with semaphore:
+                    return await self._fetch_page_async(client, page_id)
 
+            return await asyncio.gather(*(fetch_one(pid) for pid in page_ids))
+
+    def _async_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            auth=self.auth,
+            timeout=30.0,
+            verify=self._ssl_ctx,
+            base_url=self.api_url,
+            headers={"Accept": "application/json"},
+        )
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception(_should_retry),
+        reraise=True,
+    )
+    async def _fetch_page_async(
+        self, client: httpx.AsyncClient, page_id: str
+    ) -> PageData:
+        page_resp, attach_resp = await asyncio.gather(
+            client.get(f"/pages/{page_id}", params={"body-format": "storage"}),
+            client.get(f"/pages/{page_id}/attachments"),
+        )
+        data = self._page_json(page_id, page_resp)
+        attachments = self._parse_attachments(attach_resp)
+        return self._page_data(page_id, data, attachments)
+
+    def _page_json(self, page_id: str, resp: httpx.Response) -> dict:
+        """Check a page response and return its JSON body."""
+        if resp.status_code == 404:
+            raise ConfluenceError(f"Page not found: {page_id}", 404)
+        if resp.status_code != 200:
+            raise ConfluenceError(
+                f"Failed to fetch page {page_id}: {resp.text}",
+                resp.status_code,
+            )
+        return resp.json()
+
+    def _page_data(
+        self, page_id: str, data: dict, attachments: list[Attachment]
+    ) -> PageData:
         html = data.get("body", {}).get("storage", {}).get("value", "")
         title = data.get("title", "")
         page_url = f"{self.base_url}/pages/{page_id}"
 
-        # Fetch attachments
-        attachments = self._fetch_attachments(page_id)
-
         return PageData(
             page_id=page_id,
             title=title,
@@ -92,25 +180,29 @@ class ConfluenceFetcher:
 
     def resolve_short_link(self, short_code: str) -> str:
         """Resolve a short link (/wiki/x/CODE) by following the redirect to get the page ID."""
+        cached = self._short_link_cache.get(short_code)
+        if cached is not None:
+            return cached
+
         url = f"{self.base_url}/x/{short_code}"
 
-        with httpx.Client(
-            auth=self.auth, timeout=30.0, follow_redirects=True
-        ) as client:
-            resp = client.get(url)
+        # Absolute URL overrides the client's API base_url; the short link
+        # redirects to an HTML page, so don't ask for JSON
+        resp = self._client.get(url, headers={"Accept": "*/*"}, follow_redirects=True)
 
-            if resp.status_code != 200:
-                raise ConfluenceError(
-                    f"Failed to resolve short link: {short_code}", resp.status_code
-                )
+        if resp.status_code != 200:
+            raise ConfluenceError(
+                f"Failed to resolve short link: {short_code}", resp.status_code
+            )
 
-            # The final URL after redirect should contain the page ID
-            final_url = str(resp.url)
+        # The final URL after redirect should contain the page ID
+        final_url = str(resp.url)
 
         from confluence_2_md.url_parser import parse_confluence_url
 
         parsed = parse_confluence_url(final_url)
         if parsed["page_id"]:
+            self._short_link_cache[short_code] = parsed["page_id"]
             return parsed["page_id"]
         raise ConfluenceError(
             f"Could not extract page ID from resolved URL: {final_url}"
@@ -123,14 +215,15 @@ class ConfluenceFetcher:
     )
     def _fetch_attachments(self, page_id: str) -> list[Attachment]:
         """Fetch the list of attachments for a page."""
-        url = f"{self.api_url}/pages/{page_id}/attachments"
+        resp = self._client.get(f"/pages/{page_id}/attachments")
+        return self._parse_attachments(resp)
 
-        with httpx.Client(auth=self.auth, timeout=30.0) as client:
-            resp = client.get(url, headers=self._headers())
-            if resp.status_code != 200:
-                return []
+    def _parse_attachments(self, resp: httpx.Response) -> list[Attachment]:
+        """Build Attachment records from an attachments listing response."""
+        if resp.status_code != 200:
+            return []
 
-            data = resp.json()
+        data = resp.json()
 
         attachments = []
         for item in data.get("results", []):
@@ -155,13 +248,41 @@ class ConfluenceFetcher:
         dest_dir.mkdir(parents=True, exist_ok=True)
         dest_path = dest_dir / attachment.filename
 
-        with httpx.Client(
-            auth=self.auth, timeout=60.0, follow_redirects=True, verify=False
-        ) as client:
-            with client.stream("GET", attachment.download_url) as resp:
-                resp.raise_for_status()
-                with open(dest_path, "wb") as f:
-                    for chunk in resp.iter_bytes(chunk_size=8192):
-                        f.write(chunk)
+        with self._dl_client.stream("GET", attachment.download_url) as resp:
+            resp.raise_for_status()
+            # Chunks are large enough that Python-level file buffering only
+            # adds a copy, so write them straight through. Unbuffered writes
+            # may be partial, hence the memoryview loop.
+            with open(dest_path, "wb", buffering=0) as f:
+                for chunk in resp.iter_bytes(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                    view = memoryview(chunk)
+                    while view:
+                        view = view[f.write(view):]
 
         return dest_path
+
+    def download_attachments(
+        self,
+        attachments: list[Attachment],
+        dest_dir: Path,
+        max_workers: int = _DOWNLOAD_WORKERS,
+        on_error: Callable[[Attachment, Exception], None] | None = None,
+    ) -> list[Path | None]:
+        """Download attachments concurrently over the shared download client.
+
+        Returns the local paths in input order. If on_error is given, a failed
+        download is reported to it and yields None; otherwise the first
+        failure is raised.
+        """
+
+        def download(attachment: Attachment) -> Path | None:
+            try:
+                return self.download_attachment(attachment, dest_dir)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(attachment, e)
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(download, attachments))
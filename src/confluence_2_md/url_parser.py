@@ -3,6 +3,12 @@
 import re
 from urllib.parse import urlparse
 
+_NUMERIC_RE = re.compile(r"\d+")
+_SPACES_PAGES_RE = re.compile(r"/wiki/spaces/([^/]+)/pages/(\d+)")
+_DISPLAY_RE = re.compile(r"/wiki/display/([^/]+)/")
+_SHORT_RE = re.compile(r"/wiki/x/([A-Za-z0-9_-]+)")
+_PAGES_RE = re.compile(r"/pages/(\d+)")
+
 
 def parse_confluence_url(url_or_id: str) -> dict:
     """Parse a Confluence URL or page ID and extract components.
@@ -20,7 +26,7 @@ def parse_confluence_url(url_or_id: str) -> dict:
     url_or_id = url_or_id.strip()
 
     # Pure numeric page ID
-    if re.fullmatch(r"\d+", url_or_id):
+    if _NUMERIC_RE.fullmatch(url_or_id):
         return {
             "page_id": url_or_id,
             "short_link": None,
@@ -35,9 +41,11 @@ def parse_confluence_url(url_or_id: str) -> dict:
 
     base_url = f"{parsed.scheme}://{parsed.netloc}/wiki"
     path = parsed.path
+    # Each pattern starts with a fixed path segment; checking for it first
+    # skips the regex search for URL shapes that can't match
 
     # Standard page URL: /wiki/spaces/SPACE/pages/123456/Title
-    m = re.search(r"/wiki/spaces/([^/]+)/pages/(\d+)", path)
+    m = _SPACES_PAGES_RE.search(path) if "/spaces/" in path else None
     if m:
         return {
             "page_id": m.group(2),
@@ -47,7 +55,7 @@ def parse_confluence_url(url_or_id: str) -> dict:
         }
 
     # Legacy display URL: /wiki/display/SPACE/Title (no page ID available)
-    m = re.search(r"/wiki/display/([^/]+)/", path)
+    m = _DISPLAY_RE.search(path) if "/display/" in path else None
     if m:
         return {
             "page_id": None,
@@ -57,7 +65,7 @@ def parse_confluence_url(url_or_id: str) -> dict:
         }
 
     # Short URL: /wiki/x/AbCdEf
-    m = re.search(r"/wiki/x/([A-Za-z0-9_-]+)", path)
+    m = _SHORT_RE.search(path) if "/x/" in path else None
     if m:
         return {
             "page_id": None,
@@ -67,7 +75,7 @@ def parse_confluence_url(url_or_id: str) -> dict:
         }
 
     # Fallback: try to find any numeric page ID in the path
-    m = re.search(r"/pages/(\d+)", path)
+    m = _PAGES_RE.search(path) if "/pages/" in path else None
     if m:
         return {
             "page_id": m.group(1),
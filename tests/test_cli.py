@@ -0,0 +1,15 @@
+"""Tests for CLI helpers."""
+
+from confluence_2_md.cli import _sanitize_filename
+
+
+def test_sanitize_filename_replaces_illegal_chars():
+    assert _sanitize_filename('a<b>:c/d\\e|f?g*h') == "a b c d e f g h"
+
+
+def test_sanitize_filename_collapses_spaces():
+    assert _sanitize_filename("  Release:  2024 / Q1  ") == "Release 2024 Q1"
+
+
+def test_sanitize_filename_fallback():
+    assert _sanitize_filename('??') == "page"
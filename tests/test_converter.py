@@ -1,6 +1,8 @@
 """Tests for Confluence HTML → Markdown converter."""
 
-from confluence_2_md.converter import convert
+import io
+
+from confluence_2_md.converter import _get_converter, _postprocess, convert, convert_stream
 
 
 class TestCodeBlocks:
@@ -57,6 +59,34 @@ class TestInfoPanels:
         md = convert(html)
         assert "**Note: My Title**" in md
 
+    def test_obsidian_callout_converts_nested_macros(self):
+        html = """
+        <ac:structured-macro ac:name="info">
+            <ac:rich-text-body>
+                <p>Hi <ac:emoticon ac:name="smile" /></p>
+                <ac:structured-macro ac:name="status">
+                    <ac:parameter ac:name="title">Done</ac:parameter>
+                </ac:structured-macro>
+            </ac:rich-text-body>
+        </ac:structured-macro>
+        """
+        md = convert(html, obsidian=True)
+        assert "> [!info]" in md
+        assert "\U0001f642" in md
+        assert "**[DONE]**" in md
+
+    def test_obsidian_callout_highlight(self):
+        html = """
+        <ac:structured-macro ac:name="tip">
+            <ac:rich-text-body>
+                <p><span class="highlight-yellow">y</span> ok</p>
+            </ac:rich-text-body>
+        </ac:structured-macro>
+        """
+        md = convert(html, obsidian=True)
+        assert "> ==y== ok" in md
+        assert "<mark" not in md
+
 
 class TestExpandMacro:
     def test_expand(self):
@@ -92,6 +122,34 @@ class TestTaskLists:
         assert "[ ]" in md
         assert "Todo task" in md
 
+    def test_marker_spacing_with_padded_body(self):
+        html = """
+        <ac:task-list>
+            <ac:task>
+                <ac:task-status>incomplete</ac:task-status>
+                <ac:task-body> <strong>Bold</strong> task </ac:task-body>
+            </ac:task>
+        </ac:task-list>
+        """
+        md = convert(html)
+        assert "- [ ] **Bold** task" in md
+
+    def test_marker_spacing_in_obsidian_callout(self):
+        html = """
+        <ac:structured-macro ac:name="info">
+            <ac:rich-text-body>
+                <ac:task-list>
+                    <ac:task>
+                        <ac:task-status>incomplete</ac:task-status>
+                        <ac:task-body> <strong>Bold</strong> task </ac:task-body>
+                    </ac:task>
+                </ac:task-list>
+            </ac:rich-text-body>
+        </ac:structured-macro>
+        """
+        md = convert(html, obsidian=True)
+        assert "> - [ ] **Bold** task" in md
+
 
 class TestUserMentions:
     def test_user_mention(self):
@@ -147,6 +205,17 @@ class TestImages:
         md = convert(html)
         assert "https://example.com/img.png" in md
 
+    def test_skip_images(self):
+        html = """
+        <p>Before</p>
+        <ac:image>
+            <ri:attachment ri:filename="diagram.png" />
+        </ac:image>
+        """
+        md = convert(html, skip_images=True)
+        assert "Before" in md
+        assert "diagram.png" not in md
+
 
 class TestTocMacro:
     def test_toc_removed(self):
@@ -178,6 +247,10 @@ class TestBasicHtml:
         assert "A" in md
         assert "1" in md
 
+    def test_postprocess_whitespace(self):
+        md = _postprocess("a  \n \t\n  \n\nb\t")
+        assert md == "a\n\nb\n"
+
     def test_empty_input(self):
         assert convert("") == ""
         assert convert("   ") == ""
@@ -201,3 +274,71 @@ class TestPageLinks:
         """
         md = convert(html)
         assert "Other Page" in md
+
+
+class TestHighlights:
+    def test_highlight_class(self):
+        html = '<p><span class="highlight-yellow">hi</span></p>'
+        assert "<mark" in convert(html)
+
+    def test_background_color_style(self):
+        html = '<p><span style="background-color: rgb(1,2,3);">hi</span></p>'
+        assert convert(html) == '<mark style="background: rgb(1,2,3)">hi</mark>\n'
+
+    def test_plain_span_unwrapped(self):
+        html = '<p><span style="color: red">hi</span> there</p>'
+        assert convert(html) == "hi there\n"
+
+
+class TestConverterCache:
+    def test_converter_shared_per_mode(self):
+        assert _get_converter(False) is _get_converter(False)
+        assert _get_converter(True) is not _get_converter(False)
+
+    def test_modes_do_not_leak_between_calls(self):
+        html = '<p><span class="highlight-yellow">hi</span></p>'
+        assert "==hi==" in convert(html, obsidian=True)
+        assert "<mark" in convert(html)
+        assert "==hi==" in convert(html, obsidian=True)
+
+
+class TestConvertStream:
+    def test_matches_convert(self):
+        html = """
+        <h1>Title</h1>
+        <p>Intro   </p>
+        <ac:structured-macro ac:name="info">
+            <ac:rich-text-body><p>Panel</p></ac:rich-text-body>
+        </ac:structured-macro>
+        Loose <strong>inline</strong> text
+        <ac:structured-macro ac:name="code">
+            <ac:plain-text-body><![CDATA[x = 1]]></ac:plain-text-body>
+        </ac:structured-macro>
+        <ul><li>a</li><li>b</li></ul>
+        <div>d</div>&nbsp;<i> it </i>
+        """
+        for obsidian in (False, True):
+            out = io.StringIO()
+            convert_stream(html, out, obsidian=obsidian)
+            assert out.getvalue() == convert(html, obsidian=obsidian)
+
+    def test_matches_convert_outside_body(self):
+        cases = [
+            # lxml puts everything after the exposed </body> beside <body>
+            "<p>Intro</p>"
+            '<ac:structured-macro ac:name="html"><ac:plain-text-body>'
+            "<![CDATA[<div>x</div></body>]]>"
+            "</ac:plain-text-body></ac:structured-macro>"
+            "<h2>Section 2</h2><p>Important content</p>",
+            # leading metadata goes into <head>
+            "<title>T</title>\n\n<pre>x</pre>",
+        ]
+        for html in cases:
+            out = io.StringIO()
+            convert_stream(html, out)
+            assert out.getvalue() == convert(html)
+
+    def test_empty_input(self):
+        out = io.StringIO()
+        convert_stream("  ", out)
+        assert out.getvalue() == ""
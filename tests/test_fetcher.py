@@ -1,9 +1,11 @@
 """Tests for Confluence fetcher (using httpx mocking)."""
 
+import asyncio
+
 import pytest
 
 from confluence_2_md.config import Settings
-from confluence_2_md.fetcher import ConfluenceError, ConfluenceFetcher
+from confluence_2_md.fetcher import Attachment, ConfluenceError, ConfluenceFetcher
 
 
 @pytest.fixture
@@ -59,6 +61,72 @@ class TestFetchPage:
         with pytest.raises(ConfluenceError, match="Page not found"):
             fetcher.fetch_page("999")
 
+    def test_client_reused_across_calls(self, fetcher, httpx_mock):
+        for _ in range(2):
+            httpx_mock.add_response(
+                url="https://test.atlassian.net/wiki/api/v2/pages/123?body-format=storage",
+                json=_make_page_response(),
+            )
+            httpx_mock.add_response(
+                url="https://test.atlassian.net/wiki/api/v2/pages/123/attachments",
+                json=_make_attachments_response(),
+            )
+
+        with fetcher:
+            client = fetcher._client
+            fetcher.fetch_page("123")
+            fetcher.fetch_page("123")
+            assert fetcher._client is client
+            assert httpx_mock.get_requests()[0].headers["Accept"] == "application/json"
+        assert client.is_closed
+
+
+class TestResolveShortLink:
+    def test_resolved_once_per_code(self, fetcher, httpx_mock):
+        httpx_mock.add_response(
+            url="https://test.atlassian.net/wiki/x/AbC",
+            status_code=302,
+            headers={"Location": "https://test.atlassian.net/wiki/spaces/D/pages/555/T"},
+        )
+        httpx_mock.add_response(
+            url="https://test.atlassian.net/wiki/spaces/D/pages/555/T",
+            text="<html/>",
+        )
+
+        assert fetcher.resolve_short_link("AbC") == "555"
+        assert fetcher.resolve_short_link("AbC") == "555"
+        assert len(httpx_mock.get_requests()) == 2
+
+
+class TestFetchPagesAsync:
+    def test_fetch_pages(self, fetcher, httpx_mock):
+        for page_id in ("1", "2"):
+            httpx_mock.add_response(
+                url=f"https://test.atlassian.net/wiki/api/v2/pages/{page_id}?body-format=storage",
+                json=_make_page_response(page_id=page_id, title=f"Page {page_id}"),
+            )
+            httpx_mock.add_response(
+                url=f"https://test.atlassian.net/wiki/api/v2/pages/{page_id}/attachments",
+                json=_make_attachments_response(),
+            )
+
+        pages = asyncio.run(fetcher.fetch_pages(["1", "2"], concurrency=2))
+        assert [p.page_id for p in pages] == ["1", "2"]
+        assert [p.title for p in pages] == ["Page 1", "Page 2"]
+
+    def test_fetch_page_async_not_found(self, fetcher, httpx_mock):
+        httpx_mock.add_response(
+            url="https://test.atlassian.net/wiki/api/v2/pages/999?body-format=storage",
+            status_code=404,
+        )
+        httpx_mock.add_response(
+            url="https://test.atlassian.net/wiki/api/v2/pages/999/attachments",
+            status_code=404,
+        )
+
+        with pytest.raises(ConfluenceError, match="Page not found"):
+            asyncio.run(fetcher.fetch_page_async("999"))
+
 
 class TestFetchAttachments:
     def test_attachments_listed(self, fetcher, httpx_mock):
@@ -80,3 +148,37 @@ class TestFetchAttachments:
         page = fetcher.fetch_page("123")
         assert len(page.attachments) == 1
         assert page.attachments[0].filename == "image.png"
+
+
+class TestDownloadAttachment:
+    def test_download_writes_file(self, fetcher, httpx_mock, tmp_path):
+        httpx_mock.add_response(
+            url="https://test.atlassian.net/wiki/download/attachments/123/image.png",
+            content=b"\x89PNG data",
+        )
+        att = Attachment(
+            filename="image.png",
+            media_type="image/png",
+            download_url="https://test.atlassian.net/wiki/download/attachments/123/image.png",
+        )
+
+        path = fetcher.download_attachment(att, tmp_path / "assets")
+        assert path == tmp_path / "assets" / "image.png"
+        assert path.read_bytes() == b"\x89PNG data"
+
+    def test_download_attachments_reports_failures(self, fetcher, httpx_mock, tmp_path):
+        base = "https://test.atlassian.net/wiki/download/attachments/123"
+        httpx_mock.add_response(url=f"{base}/a.png", content=b"a")
+        httpx_mock.add_response(url=f"{base}/b.png", status_code=500)
+        atts = [
+            Attachment(filename=name, media_type="image/png", download_url=f"{base}/{name}")
+            for name in ("a.png", "b.png")
+        ]
+        failed = []
+
+        paths = fetcher.download_attachments(
+            atts, tmp_path, on_error=lambda att, e: failed.append(att.filename)
+        )
+        assert paths == [tmp_path / "a.png", None]
+        assert (tmp_path / "a.png").read_bytes() == b"a"
+        assert failed == ["b.png"]